@@ -7,7 +7,7 @@ It stores the data in a local SQLite database (`stock_data.db`) and ensures
 that outdated samples (older than 3 days) are automatically removed.
 
 Key Features:
-- Runs in the background (via `schedule`) every 5 minutes
+- Runs in the background every 5 minutes
 - Stores all stocks in a single normalized SQLite table (symbol + timestamp as primary key)
 - Avoids duplicate insertions and unnecessary rewrites
 - Keeps only the most recent 3 days of data per stock
@@ -23,12 +23,14 @@ Usage:
 """
 
 import yfinance as yf
+import numpy as np
 import os
 from datetime import datetime, timedelta
-import schedule
 import time
 import sqlite3
-import pytz  
+from zoneinfo import ZoneInfo
+
+from logic import detect_cup_and_handle
 
 # =============================
 # Configuration and Constants
@@ -40,6 +42,10 @@ DATA_DIR = "data"
 # List of stock symbols to track (the "magnificent 7").
 STOCK_SYMBOLS = ["AAPL", "GOOGL", "MSFT", "AMZN", "NVDA", "META", "TSLA"]
 
+# NYSE timezone, resolved once at import — zoneinfo caches the zone data, so
+# cutoff computations don't re-parse DST tables the way pytz.timezone() did.
+EASTERN = ZoneInfo("America/New_York")
+
 # Ensure that the data directory exists.
 if not os.path.exists(DATA_DIR):
     os.makedirs(DATA_DIR)
@@ -48,31 +54,21 @@ if not os.path.exists(DATA_DIR):
 # Fetching Functions
 # =============================
 
-def fetch_stock_data(symbol):
-    """
-    Fetch 5-minute interval data for the past 3 days for a given stock symbol,
-    and save it as a CSV file named {SYMBOL}.csv in the data directory.
-    This will overwrite the previous file for that symbol.
+def open_db():
     """
-    stock = yf.Ticker(symbol)
-    
-    # Fetch historical data for the last 3 trading days with 5-minute intervals.
-    data = stock.history(period="3d", interval="5m")
-    save_to_sqlite(symbol, data) 
-    # Save the data to CSV in the 'data/' folder
-    print(f"Data for {symbol} saved to SQLite.")
-    return data
-
-def save_to_sqlite(symbol, df):
+    Open the writer connection for a fetch cycle and make sure the schema,
+    covering index, and WAL pragmas are in place. The connection is opened
+    in autocommit mode (isolation_level=None) so transaction boundaries are
+    controlled explicitly in `fetch_all_stocks`.
     """
-    Save the latest stock data for a specific symbol into a SQLite DB.
-    - Ensures only data from the last 3 days is kept (rolling window).
-    - Avoids duplicate inserts by checking existing timestamps.
-    """
-    
-    conn = sqlite3.connect("stock_data.db")
+    conn = sqlite3.connect("stock_data.db", isolation_level=None)
     cursor = conn.cursor()
 
+    # WAL lets the API keep reading while we write; NORMAL sync is the
+    # recommended (and safe) durability level in WAL mode.
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+
     # Create table if not exists
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS stock_data (
@@ -87,66 +83,154 @@ def save_to_sqlite(symbol, df):
         )
     """)
 
-    # Step 1: Remove old entries for this symbol (older than 3 days).
+    # Covering index: the API's per-request query
+    # (SELECT close ... WHERE symbol = ? ORDER BY timestamp) is answered
+    # entirely from this index without touching the table's row pages.
     cursor.execute("""
-        DELETE FROM stock_data
-        WHERE symbol = ?
-        AND timestamp < datetime('now', '-3 days')
-    """, (symbol,))
+        CREATE INDEX IF NOT EXISTS idx_symbol_ts
+        ON stock_data(symbol, timestamp, close)
+    """)
 
-   
-    
+    # Side table holding each symbol's full close series as one contiguous
+    # float64 blob — the API reads it back with a single np.frombuffer
+    # instead of decoding N rows and sorting them on every request — plus
+    # the pattern-detection result precomputed at ingest time.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS prices_blob (
+            symbol TEXT PRIMARY KEY,
+            closes BLOB,
+            updated_at INTEGER,
+            last_result INTEGER
+        )
+    """)
 
-    # Step 2: Filter the fetched DataFrame to only include rows from the last 3 days.
-    eastern = pytz.timezone("America/New_York")
-    # Convert current time to NYSE timezone, then subtract 3 days to get cutoff.
-    cutoff = datetime.now(eastern) - timedelta(days=3)
-    df_recent = df[df.index >= cutoff]
+    # DBs written before last_result existed need the column added in place.
+    try:
+        cursor.execute("ALTER TABLE prices_blob ADD COLUMN last_result INTEGER")
+    except sqlite3.OperationalError:
+        pass  # Column already exists.
 
+    return conn
 
-    # Step 3: Load existing timestamps from DB to avoid duplicate inserts.
-    existing = set(
-        row[0] for row in cursor.execute(
-            "SELECT timestamp FROM stock_data WHERE symbol = ?", (symbol,)
-        )
+
+def save_to_sqlite(symbol, df, conn):
+    """
+    Stage the latest batch for one symbol into its scratch table on the
+    shared writer connection, and return the stage table name.
+
+    Only rows from the last 3 days are staged (rolling window). The merge
+    into `stock_data` is deliberately NOT done here: pandas' to_sql commits
+    its own writes, so the caller merges all staged batches afterwards
+    inside one cycle-wide transaction (see `fetch_all_stocks`).
+    """
+    # Step 1: Filter the fetched DataFrame to only include rows from the last 3 days.
+    # Current time in the NYSE timezone minus 3 days gives the cutoff.
+    cutoff = datetime.now(EASTERN) - timedelta(days=3)
+    df_recent = df[df.index >= cutoff]
+
+    # Step 2: Stage the batch into a per-symbol scratch table with pandas'
+    # multi-row INSERT (one SQL statement per chunk instead of one per row,
+    # amortizing parse overhead). The chunk size keeps each statement under
+    # SQLite's 999-bound-parameter limit (6 columns x 150 rows = 900).
+    # Symbols are fixed uppercase tickers, so interpolating the table name is safe.
+    stage_table = f"stock_data_stage_{symbol}"
+    stage = df_recent[["Open", "High", "Low", "Close", "Volume"]].rename(
+        columns={"Open": "open", "High": "high", "Low": "low",
+                 "Close": "close", "Volume": "volume"}
     )
+    stage.index = df_recent.index.astype(str)
+    stage.to_sql(stage_table, conn, if_exists="replace",
+                 index_label="timestamp", method="multi", chunksize=150)
+    return stage_table
 
-    # Step 4: Prepare only new rows (not already in DB).
-    new_rows = []
-    for index, row in df_recent.iterrows():
-        ts = str(index)
-        if ts in existing:
-            continue  # Already exists — skip.
-        new_rows.append((
-            symbol, ts, row["Open"], row["High"], row["Low"], row["Close"], row["Volume"]
-        ))
 
-    # Step 5: Bulk insert all new, recent rows for this symbol.
-    cursor.executemany("""
-        INSERT INTO stock_data (symbol, timestamp, open, high, low, close, volume)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, new_rows)
+def merge_staged(symbol, stage_table, cursor):
+    """
+    Merge one symbol's staged batch into stock_data and drop its rows that
+    fell out of the 3-day window. Runs inside the cycle-wide transaction.
+    """
+    # Remove old entries for this symbol (older than 3 days).
+    cursor.execute("""
+        DELETE FROM stock_data
+        WHERE symbol = ?
+        AND timestamp < datetime('now', '-3 days')
+    """, (symbol,))
+
+    # Merge the stage in a single statement; rows whose (symbol, timestamp)
+    # already exist are ignored via the PRIMARY KEY, so bulk insert and
+    # dedup happen together inside SQLite.
+    cursor.execute(f"""
+        INSERT OR IGNORE INTO stock_data (symbol, timestamp, open, high, low, close, volume)
+        SELECT ?, timestamp, open, high, low, close, volume FROM {stage_table}
+    """, (symbol,))
+
+    # Refresh the symbol's contiguous close-price blob from the post-merge
+    # table state, so the blob always matches what the row query would
+    # return. This read runs once per symbol per 5-minute cycle — cheap
+    # here, and it saves per-row decoding on every API request.
+    rows = cursor.execute("""
+        SELECT close FROM stock_data WHERE symbol = ? ORDER BY timestamp ASC
+    """, (symbol,)).fetchall()
+    closes = np.fromiter((r[0] for r in rows), dtype=np.float64, count=len(rows))
 
-    conn.commit()
-    conn.close()
+    # Run pattern detection here, at ingest time: the series can't change
+    # until the next cycle, so the API can answer /check_pattern from this
+    # stored bit instead of scanning on the latency-critical request path.
+    detected = int(detect_cup_and_handle(closes)) if closes.size else 0
+
+    cursor.execute("""
+        INSERT OR REPLACE INTO prices_blob (symbol, closes, updated_at, last_result)
+        VALUES (?, ?, ?, ?)
+    """, (symbol, closes.tobytes(), int(time.time()), detected))
 
 
 def fetch_all_stocks():
     """
-    Fetch the data for all stocks in the list and store them.
+    Fetch the data for all stocks in the list and store them on a single
+    shared connection. All symbols are downloaded in one multi-ticker
+    yf.download call (yfinance fans the HTTP requests out over threads on
+    one keep-alive session), so wall time is ~1 round-trip instead of 7
+    sequential ones. Staging runs next (no write lock held); all DELETE +
+    merge statements then execute inside one BEGIN IMMEDIATE transaction,
+    so a full cycle pays one commit — and one fsync — instead of one per
+    symbol.
     """
-    for symbol in STOCK_SYMBOLS:
-        fetch_stock_data(symbol)
+    data = yf.download(
+        STOCK_SYMBOLS, period="3d", interval="5m",
+        group_by="ticker", threads=True, auto_adjust=False,
+    )
+
+    conn = open_db()
+    try:
+        staged = []
+        for symbol in STOCK_SYMBOLS:
+            # Per-ticker slice of the combined frame. The index is the union
+            # across tickers, so rows where this ticker has no sample come
+            # back all-NaN — drop them before staging.
+            df = data[symbol].dropna(how="all")
+            staged.append((symbol, save_to_sqlite(symbol, df, conn)))
+            print(f"Data for {symbol} staged.")
+
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")  # One write transaction for the whole cycle.
+        for symbol, stage_table in staged:
+            merge_staged(symbol, stage_table, cursor)
+        conn.commit()
+        print("All symbols merged and committed.")
+    finally:
+        conn.close()
         
-# Schedule the fetch function to run every 5 minutes to meet the criteria.
-schedule.every(5).minutes.do(fetch_all_stocks)
+# Fetch interval — 5 minutes, matching the data granularity.
+FETCH_INTERVAL_SECONDS = 300
 
 # For testing — fetch every 20 seconds.
-# schedule.every(20).seconds.do(fetch_all_stocks).
+# FETCH_INTERVAL_SECONDS = 20
 
-# Keep the script running and periodically fetch data.
+# Keep the script running and periodically fetch data. Sleeping the whole
+# interval means zero wake-ups between cycles, instead of the old
+# schedule.run_pending() loop that woke the process every second just to
+# check the clock.
 if __name__ == "__main__":
-    fetch_all_stocks()  # Time 0 fetch to avoid initial delay.
     while True:
-        schedule.run_pending()  # Run any scheduled tasks.
-        time.sleep(1)  # Sleep for a second to avoid high CPU usage.
+        fetch_all_stocks()  # First iteration runs immediately — no initial delay.
+        time.sleep(FETCH_INTERVAL_SECONDS)
@@ -23,9 +23,14 @@ The algorithm:
 The `detect_cup_and_handle(prices)` function is the main interface for other components (e.g., Flask API).
 """
 
-# import numpy as np 
+import numpy as np
 # import pandas as pd
 
+try:
+    import numba
+except ImportError:
+    numba = None  # Numba is optional — detection falls back to pure Python.
+
 # ===============================================================
 # Local extrema detection — identify highs and lows in price data
 # ===============================================================
@@ -52,6 +57,34 @@ def is_local_maxima(i, prices, window_size=5):
         return True
     return False
 
+# ================================================================
+# Default detection parameters
+# ================================================================
+
+# Built once at import — rebuilding these dicts on every call was a repeated
+# allocation on the hot request path. Callers must not mutate them.
+
+# Min required index spacing between consecutive turning points.
+_DEFAULT_DISTANCE_THRESHOLDS = {
+    'a_b': 10,  # Threshold for distance between 'a' and 'b'.
+    'b_c': 10,  # Threshold for distance between 'b' and 'c'.
+    'c_d': 10,  # Threshold for distance between 'c' and 'd'.
+    'd_e': 10   # Threshold for distance between 'd' and 'e'.
+}
+
+# Default price thresholds (tuned for ~3 trading days of 5-minute samples ≈ 234 points)
+# These values are intentionally lenient to allow pattern detection in short, noisy sequences.
+# For longer datasets or real-world applications, adjust these thresholds upward
+# to better reflect meaningful movements and reduce false positives.
+_DEFAULT_PRICE_THRESHOLDS = {
+    'a_b': 0.005,  # drop from a to b.
+    'b_c': 0.005,  # rise from b to c.
+    'a_c': 0.005,  # diff from a to c.
+    'c_d': 0.005,  # drop from c to d.
+    'b_d': 0.005,  # rise from b to d.
+    'd_e': 0.005   # rise from d to e.
+}
+
 # ================================================================
 # Validation helpers — check spacing and price change requirements
 # ================================================================
@@ -67,59 +100,149 @@ def distance_is_valid(a, b, distance_thresholds, pair_name):
     return False
 
 def price_difference_is_valid(a, b, c, d, e, prices, price_thresholds):
-    """    
+    """
     Applies constraints to validate shape of the cup and handle based on price deltas.
+    Points not chosen yet may be passed as None — only constraints whose
+    endpoints are both known are applied.
     """
-    valid = True
-
-    # Check price difference between a and b (b should be at least price_thresholds['a_b'] % lower than a).
-    if a is not None and b is not None and prices[a] - prices[b] <= price_thresholds['a_b'] * prices[a]:
-        valid = False
-
-    # Check price difference between b and c (c should be at least price_thresholds['b_c'] % higher than b).
-    if b is not None and c is not None and prices[c] - prices[b] <= price_thresholds['b_c'] * prices[b]:
-        valid = False
-
-    # Check price difference between a and c (c should be at most price_thresholds['a_c'] % higher/lower than a).
-    if a is not None and c is not None and abs(prices[c] - prices[a]) >= price_thresholds['a_c'] * prices[a]:
-        valid = False
-
-
-    # Check price difference between c and d (d should be at least price_thresholds['c_d'] % lower than c).
-    if c is not None and d is not None and prices[c] - prices[d] <= price_thresholds['c_d'] * prices[c]:
-        valid = False
-
-    # Check price difference between b and d (d should be at least price_thresholds['b_d'] % lower than b).
-    if b is not None and d is not None and prices[d] - prices[b] <= price_thresholds['b_d'] * prices[b]:
-        valid = False
-
-    # Check price difference between d and e (e should be at least price_thresholds['d_e'] % higher than d).
-    if d is not None and e is not None and prices[e] - prices[d] <= price_thresholds['d_e'] * prices[d]:
-        valid = False
-
-    return valid
+    # Index each price exactly once into a local; the old version re-indexed
+    # prices[x] (a list item fetch + float unbox) inside every predicate.
+    pa = None if a is None else prices[a]
+    pb = None if b is None else prices[b]
+    pc = None if c is None else prices[c]
+    pd = None if d is None else prices[d]
+    pe = None if e is None else prices[e]
+
+    # One chained expression instead of six `valid = False` reassignments:
+    # `and` short-circuits on the first failed constraint.
+    return (
+        # b should be at least price_thresholds['a_b'] % lower than a.
+        (pa is None or pb is None or pa - pb > price_thresholds['a_b'] * pa)
+        # c should be at least price_thresholds['b_c'] % higher than b.
+        and (pb is None or pc is None or pc - pb > price_thresholds['b_c'] * pb)
+        # c should be at most price_thresholds['a_c'] % higher/lower than a.
+        and (pa is None or pc is None or abs(pc - pa) < price_thresholds['a_c'] * pa)
+        # d should be at least price_thresholds['c_d'] % lower than c.
+        and (pc is None or pd is None or pc - pd > price_thresholds['c_d'] * pc)
+        # d should be at least price_thresholds['b_d'] % higher than b.
+        and (pb is None or pd is None or pd - pb > price_thresholds['b_d'] * pb)
+        # e should be at least price_thresholds['d_e'] % higher than d.
+        and (pd is None or pe is None or pe - pd > price_thresholds['d_e'] * pd)
+    )
 
 # ==============================================================
 # Helper for extracting extrema across price series
 # ==============================================================
 
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def _find_extrema_jit(prices, window_size):
+        """
+        Compiled extrema scan in a single O(N) pass using monotonic deques
+        (Lemire's streaming min/max): instead of re-scanning the 2w window
+        around every index, each index is pushed/popped at most once per
+        deque. A center is a strict local max iff it sits at the front of
+        the max-deque once its window is complete, and the next deque entry
+        (if any) is strictly below it — the second condition rejects ties,
+        which equal pops alone would miss. Same structure, mirrored, for
+        minima. The deques are plain int64 index arrays with head/tail
+        cursors (Numba-friendly, no allocation in the loop).
+        """
+        n = prices.shape[0]
+        maxima = np.empty(n, dtype=np.int64)
+        minima = np.empty(n, dtype=np.int64)
+        n_max = 0
+        n_min = 0
+        span = 2 * window_size + 1
+        if n < span:
+            return maxima[:0], minima[:0]
+
+        max_dq = np.empty(n, dtype=np.int64)
+        min_dq = np.empty(n, dtype=np.int64)
+        max_head = 0
+        max_tail = 0
+        min_head = 0
+        min_tail = 0
+
+        for i in range(n):
+            p = prices[i]
+
+            # Push i, popping strictly smaller (resp. larger) tail entries so
+            # each deque stays non-increasing (resp. non-decreasing) in price.
+            # Equal entries are kept — they are what makes ties detectable.
+            while max_tail > max_head and prices[max_dq[max_tail - 1]] < p:
+                max_tail -= 1
+            max_dq[max_tail] = i
+            max_tail += 1
+            while min_tail > min_head and prices[min_dq[min_tail - 1]] > p:
+                min_tail -= 1
+            min_dq[min_tail] = i
+            min_tail += 1
+
+            # Evict front entries that fell out of the window ending at i.
+            lo = i - span + 1
+            while max_dq[max_head] < lo:
+                max_head += 1
+            while min_dq[min_head] < lo:
+                min_head += 1
+
+            # The window around center c = i - window_size is now complete.
+            c = i - window_size
+            if c >= window_size:
+                if max_dq[max_head] == c and (
+                    max_tail - max_head == 1 or prices[max_dq[max_head + 1]] < prices[c]
+                ):
+                    maxima[n_max] = c
+                    n_max += 1
+                if min_dq[min_head] == c and (
+                    min_tail - min_head == 1 or prices[min_dq[min_head + 1]] > prices[c]
+                ):
+                    minima[n_min] = c
+                    n_min += 1
+
+        return maxima[:n_max], minima[:n_min]
+
+    # Warm up the JIT on a tiny dummy input at import time, so the first
+    # real request doesn't pay the compilation cost.
+    _find_extrema_jit(np.zeros(4, dtype=np.float64), 1)
+
+
+def _find_extrema_numpy(prices, window_size):
+    """
+    Vectorized extrema scan used when Numba isn't installed.
+    sliding_window_view exposes every (2w+1)-wide window as a row of a
+    zero-copy strided view; a center is a strict local max (min) iff it is
+    greater (lower) than the max (min) of its window with the center column
+    removed. All loops run as C-level NumPy reductions.
+    """
+    n = prices.shape[0]
+    span = 2 * window_size + 1
+    if n < span:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    windows = np.lib.stride_tricks.sliding_window_view(prices, span)
+    neighbors = np.delete(windows, window_size, axis=1)  # Drop the center column.
+    centers = prices[window_size:n - window_size]
+    maxima = np.flatnonzero(centers > neighbors.max(axis=1)) + window_size
+    minima = np.flatnonzero(centers < neighbors.min(axis=1)) + window_size
+    return maxima, minima
+
+
 def get_min_max_indices(prices, window_size=5):
     """
     Returns indices of local minima and maxima in the price array.
     The `window_size` determines how many neighbors on each side must be
     lower (for maxima) or higher (for minima) for a point to qualify.
     A higher value filters out short-term noise, detecting stronger reversals.
+    When Numba is installed the scan runs as native code; otherwise it runs
+    through NumPy's vectorized sliding-window reductions.
     """
-    maxima = []
-    minima = []
-
-    for i in range(window_size, len(prices) - window_size):  # Ensure we have enough data for the window.
-        if is_local_maxima(i, prices, window_size):
-            maxima.append(i)
-        if is_local_minima(i, prices, window_size):
-            minima.append(i)
-
-    return maxima, minima
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    if numba is not None:
+        return _find_extrema_jit(prices, window_size)
+    return _find_extrema_numpy(prices, window_size)
 
 # ==============================================================
 # Main pattern detection logic
@@ -127,87 +250,323 @@ def get_min_max_indices(prices, window_size=5):
 
 """
 NOTE:
-- This implementation currently uses nested loops to scan over all combinations of local maxima and minima (a, b, c, d, e).
+- This implementation uses nested loops to scan over all combinations of local maxima and minima (a, b, c, d, e).
 - While it doesn't scan the full O(n^5) space (since it only iterates extrema and applies early pruning),
   the worst-case complexity is approximately O(m^5), where m = number of extrema points.
 - This is acceptable for short sequences (~200-300 points), but could be costly on longer or noisy series.
-- Future optimization (see TODO below) should include constrained windowed searches to reduce computation time.
+- Callers that only need a yes/no answer should use `any_cup_and_handle` (first-match early exit)
+  or `_pattern_exists_vectorized` instead; this enumerating version exists for debugging/visualization.
 """
 
 def find_cup_and_handle_pattern(prices, window_size=5, price_thresholds=None, distance_thresholds=None):
-    
+
     valid_patterns = []
 
-    # Default distance thresholds if not provided.
     if distance_thresholds is None:
-        distance_thresholds = {
-            'a_b': 10,  # Threshold for distance between 'a' and 'b'.
-            'b_c': 10,  # Threshold for distance between 'b' and 'c'.
-            'c_d': 10,  # Threshold for distance between 'c' and 'd'.
-            'd_e': 10   # Threshold for distance between 'd' and 'e'.
-        }
-
-    
-    # Default price thresholds (tuned for ~3 trading days of 5-minute samples ≈ 234 points)
-    # These values are intentionally lenient to allow pattern detection in short, noisy sequences.
-    # For longer datasets or real-world applications, adjust these thresholds upward
-    # to better reflect meaningful movements and reduce false positives.
-
+        distance_thresholds = _DEFAULT_DISTANCE_THRESHOLDS
     if price_thresholds is None:
-        price_thresholds = {
-            'a_b': 0.005,  # drop from a to b.
-            'b_c': 0.005,  # rise from b to c.
-            'a_c': 0.005,   # diff from a to c.
-            'c_d': 0.005,  # drop from c to d.
-            'b_d': 0.005,   # rise from b to d.
-            'd_e': 0.005   # rise from d to e.
-        }
+        price_thresholds = _DEFAULT_PRICE_THRESHOLDS
 
     # Get the list of maxima and minima.
     maxima, minima = get_min_max_indices(prices, window_size)
 
+    # Unpack thresholds into locals — LOAD_FAST instead of dict lookups in
+    # the hottest loops. The spacing/price checks below are the inlined
+    # bodies of distance_is_valid / price_difference_is_valid, applied
+    # cumulatively as each turning point is chosen.
+    d_ab = distance_thresholds['a_b']
+    d_bc = distance_thresholds['b_c']
+    d_cd = distance_thresholds['c_d']
+    d_de = distance_thresholds['d_e']
+    t_ab = price_thresholds['a_b']
+    t_bc = price_thresholds['b_c']
+    t_ac = price_thresholds['a_c']
+    t_cd = price_thresholds['c_d']
+    t_bd = price_thresholds['b_d']
+    t_de = price_thresholds['d_e']
+
     # Iterate over the maxima and minima lists.
     for i in range(len(maxima) - 4):  # We need at least 5 points: a, b, c, d, e.
         a = maxima[i]
-
-        # TODO:
-        # Optimize this brute-force search by limiting the search window size between each pair (a-b, b-c, c-d, d-e).
-        # This can reduce the complexity from O(m^5) to something closer to O(m^2–m^3) by avoiding unnecessary combinations.
-        # For example:
-        #   - Look for b within a sliding window after a.
-        #   - Limit c to points close to a in price and within b+N.
-        #   - Use early exit (return True) once a valid pattern is found.
+        pa = prices[a]
+        ab_drop = t_ab * pa   # Min drop required from a to b.
+        ac_band = t_ac * pa   # Max allowed gap between the cup rims a and c.
 
         # Check for the corresponding 'b' (minima after 'a').
         for b in minima:
-            if b > a and distance_is_valid(a, b, distance_thresholds, 'a_b'):
-                # Check the price difference condition immediately.
-                if not price_difference_is_valid(a, b, None, None, None, prices, price_thresholds):
+            if b <= a or b - a < d_ab:
+                continue
+            pb = prices[b]
+            if pa - pb <= ab_drop:
+                continue  # Skip if price difference is invalid.
+            bc_rise = t_bc * pb
+            bd_rise = t_bd * pb
+
+            # Now find the next 'c' (maxima after 'b').
+            for c in maxima:
+                if c <= b or c - b < d_bc:
+                    continue
+                pc = prices[c]
+                if pc - pb <= bc_rise or abs(pc - pa) >= ac_band:
                     continue  # Skip if price difference is invalid.
+                cd_drop = t_cd * pc
+
+                # Now find the next 'd' (minima after 'c').
+                for d in minima:
+                    if d <= c or d - c < d_cd:
+                        continue
+                    pd = prices[d]
+                    if pc - pd <= cd_drop or pd - pb <= bd_rise:
+                        continue  # Skip if price difference is invalid.
+                    de_rise = t_de * pd
+
+                    # Finally, check for 'e' (maxima after 'd').
+                    for e in maxima:
+                        if e <= d or e - d < d_de:
+                            continue
+                        if prices[e] - pd > de_rise:
+                            valid_patterns.append((a, b, c, d, e))
 
-                # Now find the next 'c' (maxima after 'b').
-                for c in maxima:
-                    if c > b and distance_is_valid(b, c, distance_thresholds, 'b_c'):
-                        # Check the price difference condition immediately.
-                        if not price_difference_is_valid(a, b, c, None, None, prices, price_thresholds):
-                            continue  # Skip if price difference is invalid.
-
-                        # Now find the next 'd' (minima after 'c').
-                        for d in minima:
-                            if d > c and distance_is_valid(c, d, distance_thresholds, 'c_d'):
-                                # Check the price difference condition immediately.
-                                if not price_difference_is_valid(a, b, c, d, None, prices, price_thresholds):
-                                    continue  # Skip if price difference is invalid.
-
-                                # Finally, check for 'e' (maxima after 'd').
-                                for e in maxima:
-                                    if e > d and distance_is_valid(d, e, distance_thresholds, 'd_e'):
-                                        # Now check if all price difference conditions are met.
-                                        if price_difference_is_valid(a, b, c, d, e, prices, price_thresholds):
-                                            valid_patterns.append((a, b, c, d, e))
-    
     return valid_patterns
 
+# ==============================================================
+# Short-circuiting existence check
+# ==============================================================
+
+def any_cup_and_handle(prices, window_size=5, price_thresholds=None, distance_thresholds=None):
+    """
+    Boolean variant of `find_cup_and_handle_pattern`: returns True at the
+    FIRST (a, b, c, d, e) combination that satisfies all constraints instead
+    of collecting every match. Callers that only need a yes/no answer (the
+    API) skip all remaining work once one pattern is found.
+
+    The threshold multiplications (e.g. price_thresholds['a_b'] * prices[a])
+    are hoisted to the loop level where their operands become known, so the
+    innermost loops only do comparisons on local floats.
+    """
+    if distance_thresholds is None:
+        distance_thresholds = _DEFAULT_DISTANCE_THRESHOLDS
+    if price_thresholds is None:
+        price_thresholds = _DEFAULT_PRICE_THRESHOLDS
+
+    maxima, minima = get_min_max_indices(prices, window_size)
+
+    # Unpack thresholds into locals — no dict lookups inside the loop nest.
+    d_ab = distance_thresholds['a_b']
+    d_bc = distance_thresholds['b_c']
+    d_cd = distance_thresholds['c_d']
+    d_de = distance_thresholds['d_e']
+    t_ab = price_thresholds['a_b']
+    t_bc = price_thresholds['b_c']
+    t_ac = price_thresholds['a_c']
+    t_cd = price_thresholds['c_d']
+    t_bd = price_thresholds['b_d']
+    t_de = price_thresholds['d_e']
+
+    for i in range(len(maxima) - 4):
+        a = maxima[i]
+        pa = prices[a]
+        ab_drop = t_ab * pa   # Min drop required from a to b.
+        ac_band = t_ac * pa   # Max allowed gap between the cup rims a and c.
+
+        for b in minima:
+            if b <= a or b - a < d_ab:
+                continue
+            pb = prices[b]
+            if pa - pb <= ab_drop:
+                continue
+            bc_rise = t_bc * pb
+            bd_rise = t_bd * pb
+
+            for c in maxima:
+                if c <= b or c - b < d_bc:
+                    continue
+                pc = prices[c]
+                if pc - pb <= bc_rise or abs(pc - pa) >= ac_band:
+                    continue
+                cd_drop = t_cd * pc
+
+                for d in minima:
+                    if d <= c or d - c < d_cd:
+                        continue
+                    pd = prices[d]
+                    if pc - pd <= cd_drop or pd - pb <= bd_rise:
+                        continue
+                    de_rise = t_de * pd
+
+                    for e in maxima:
+                        if e <= d or e - d < d_de:
+                            continue
+                        if prices[e] - pd > de_rise:
+                            return True  # First valid pattern — done.
+
+    return False
+
+# ==============================================================
+# Vectorized existence check (NumPy)
+# ==============================================================
+
+def _pattern_exists_vectorized(prices, window_size=5, price_thresholds=None, distance_thresholds=None):
+    """
+    Boolean "does any cup-and-handle exist?" check, vectorized with NumPy.
+
+    Instead of five nested Python loops over (a, b, c, d, e) candidates, this
+    builds pairwise boolean constraint matrices between the extrema lists via
+    broadcasting (one matrix per pair: a-b, b-c, c-d, d-e, plus the a-c and
+    b-d cross checks) and chains them with matrix products. A pattern exists
+    iff some path a->b->c->d->e survives all masks, so the whole search runs
+    as a handful of C-level array operations.
+
+    Use `find_cup_and_handle_pattern` when the actual index tuples are needed
+    (e.g., for debugging/visualization); this function only answers yes/no.
+    """
+    if distance_thresholds is None:
+        distance_thresholds = _DEFAULT_DISTANCE_THRESHOLDS
+    if price_thresholds is None:
+        price_thresholds = _DEFAULT_PRICE_THRESHOLDS
+
+    prices = np.asarray(prices, dtype=np.float64)
+    maxima, minima = get_min_max_indices(prices, window_size)
+    maxima = np.asarray(maxima, dtype=np.int64)
+    minima = np.asarray(minima, dtype=np.int64)
+
+    # Mirror the loop version: 'a' only ranges over maxima[:-4].
+    a_idx = maxima[:len(maxima) - 4] if len(maxima) > 4 else maxima[:0]
+    if a_idx.size == 0 or minima.size == 0:
+        return False
+
+    pa = prices[a_idx]      # Prices at 'a' candidates (maxima subset).
+    pmax = prices[maxima]   # Prices at maxima ('c' / 'e' candidates).
+    pmin = prices[minima]   # Prices at minima ('b' / 'd' candidates).
+
+    # Pairwise masks: each combines the index-distance constraint with the
+    # corresponding price-change constraint from price_difference_is_valid.
+    gap = minima[None, :] - a_idx[:, None]
+    ab = (gap > 0) & (gap >= distance_thresholds['a_b']) \
+        & (pa[:, None] - pmin[None, :] > price_thresholds['a_b'] * pa[:, None])
+
+    gap = maxima[None, :] - minima[:, None]
+    bc = (gap > 0) & (gap >= distance_thresholds['b_c']) \
+        & (pmax[None, :] - pmin[:, None] > price_thresholds['b_c'] * pmin[:, None])
+
+    # a-c has no distance threshold, only the "rim levels match" price check.
+    ac = np.abs(pmax[None, :] - pa[:, None]) < price_thresholds['a_c'] * pa[:, None]
+
+    gap = minima[None, :] - maxima[:, None]
+    cd = (gap > 0) & (gap >= distance_thresholds['c_d']) \
+        & (pmax[:, None] - pmin[None, :] > price_thresholds['c_d'] * pmax[:, None])
+
+    # b-d has no distance threshold either (handle dip stays above cup bottom).
+    bd = pmin[None, :] - pmin[:, None] > price_thresholds['b_d'] * pmin[:, None]
+
+    gap = maxima[None, :] - minima[:, None]
+    de = (gap > 0) & (gap >= distance_thresholds['d_e']) \
+        & (pmax[None, :] - pmin[:, None] > price_thresholds['d_e'] * pmin[:, None])
+
+    # Fold the chain right-to-left with boolean matrix products, applying each
+    # cross constraint (b_d, a_c) at the level where both endpoints are in scope.
+    de_any = de.any(axis=1)                                       # 'd' that can reach some 'e'.
+    cd_ok = cd & de_any[None, :]                                  # (c, d) pairs with a valid tail.
+    b_to_c = (bd.astype(np.int64) @ cd_ok.T.astype(np.int64)) > 0  # (b, c) pairs with a valid d-e tail.
+    b_to_c &= bc
+    a_to_c = (ab.astype(np.int64) @ b_to_c.astype(np.int64)) > 0  # (a, c) reachability through some b.
+    return bool((a_to_c & ac).any())
+
+# ==============================================================
+# Fully compiled detector (Numba)
+# ==============================================================
+
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def _detect_jit(prices, window_size, t_ab, t_bc, t_ac, t_cd, t_bd, t_de,
+                    d_ab, d_bc, d_cd, d_de):
+        """
+        The whole detection pipeline — extrema scan plus the five-deep
+        candidate search — as one compiled kernel over scalars, returning
+        at the first valid pattern. Thresholds arrive unpacked so the loop
+        body is pure register arithmetic, no dict or tuple traffic.
+        """
+        maxima, minima = _find_extrema_jit(prices, window_size)
+        n_max = maxima.shape[0]
+        n_min = minima.shape[0]
+
+        for i in range(n_max - 4):
+            a = maxima[i]
+            pa = prices[a]
+            ab_drop = t_ab * pa
+            ac_band = t_ac * pa
+
+            for j in range(n_min):
+                b = minima[j]
+                if b <= a or b - a < d_ab:
+                    continue
+                pb = prices[b]
+                if pa - pb <= ab_drop:
+                    continue
+                bc_rise = t_bc * pb
+                bd_rise = t_bd * pb
+
+                for k in range(n_max):
+                    c = maxima[k]
+                    if c <= b or c - b < d_bc:
+                        continue
+                    pc = prices[c]
+                    if pc - pb <= bc_rise or abs(pc - pa) >= ac_band:
+                        continue
+                    cd_drop = t_cd * pc
+
+                    for l in range(n_min):
+                        d = minima[l]
+                        if d <= c or d - c < d_cd:
+                            continue
+                        pd = prices[d]
+                        if pc - pd <= cd_drop or pd - pb <= bd_rise:
+                            continue
+                        de_rise = t_de * pd
+
+                        for m in range(n_max):
+                            e = maxima[m]
+                            if e <= d or e - d < d_de:
+                                continue
+                            if prices[e] - pd > de_rise:
+                                return True
+        return False
+
+    @numba.njit(cache=True, parallel=True)
+    def _detect_batch_jit(price_rows, lengths, window_size, t_ab, t_bc, t_ac,
+                          t_cd, t_bd, t_de, d_ab, d_bc, d_cd, d_de):
+        """
+        Batch companion: scores one padded row per symbol in parallel
+        (numba.prange over the outermost loop).
+        """
+        n = price_rows.shape[0]
+        results = np.zeros(n, dtype=np.bool_)
+        for s in numba.prange(n):
+            results[s] = _detect_jit(price_rows[s, :lengths[s]], window_size,
+                                     t_ab, t_bc, t_ac, t_cd, t_bd, t_de,
+                                     d_ab, d_bc, d_cd, d_de)
+        return results
+
+    # Warm up both kernels at import time (same argument types as the real
+    # calls), so no request pays the JIT cost.
+    _detect_jit(np.zeros(4, dtype=np.float64), 1,
+                0.005, 0.005, 0.005, 0.005, 0.005, 0.005, 10, 10, 10, 10)
+    _detect_batch_jit(np.zeros((1, 4), dtype=np.float64),
+                      np.array([4], dtype=np.int64), 1,
+                      0.005, 0.005, 0.005, 0.005, 0.005, 0.005, 10, 10, 10, 10)
+
+
+def _unpacked_thresholds(price_thresholds, distance_thresholds):
+    """
+    Flatten the threshold dicts into the positional scalar tuple the compiled
+    kernels take.
+    """
+    th = price_thresholds
+    dist = distance_thresholds
+    return (th['a_b'], th['b_c'], th['a_c'], th['c_d'], th['b_d'], th['d_e'],
+            dist['a_b'], dist['b_c'], dist['c_d'], dist['d_e'])
+
 # ==============================================================
 # Public API — used by Flask app
 # ==============================================================
@@ -216,8 +575,32 @@ def detect_cup_and_handle(prices):
     """
     Returns True if at least one valid cup-and-handle pattern is found.
     """
-    valid_patterns = find_cup_and_handle_pattern(prices)
-    return len(valid_patterns) > 0
+    # Convert once at the API boundary so all downstream steps work on a
+    # contiguous float64 array instead of a boxed Python list.
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    if numba is not None:
+        args = _unpacked_thresholds(_DEFAULT_PRICE_THRESHOLDS, _DEFAULT_DISTANCE_THRESHOLDS)
+        return bool(_detect_jit(prices, 5, *args))
+    return _pattern_exists_vectorized(prices)
+
+
+def detect_cup_and_handle_batch(price_series):
+    """
+    Score several symbols at once: takes an iterable of 1-D price sequences
+    and returns a list of booleans. With Numba available the rows are packed
+    into one padded float64 matrix and scored in parallel across cores;
+    otherwise each series goes through the vectorized check sequentially.
+    """
+    arrays = [np.ascontiguousarray(p, dtype=np.float64) for p in price_series]
+    if numba is None or not arrays:
+        return [_pattern_exists_vectorized(a) for a in arrays]
+
+    lengths = np.array([a.shape[0] for a in arrays], dtype=np.int64)
+    rows = np.zeros((len(arrays), int(lengths.max())), dtype=np.float64)
+    for i, a in enumerate(arrays):
+        rows[i, :a.shape[0]] = a
+    args = _unpacked_thresholds(_DEFAULT_PRICE_THRESHOLDS, _DEFAULT_DISTANCE_THRESHOLDS)
+    return [bool(r) for r in _detect_batch_jit(rows, lengths, 5, *args)]
 
 # ==============================================================
 # Debugging / Visualization Helpers (Optional)